@@ -38,37 +38,259 @@ http://localhost:8000/ para ver el formulario de carga.
 
 import argparse
 import cgi
+import gzip
+import html
 import io
 import os
 import base64
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import string
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse
 
+import numpy as np
 import pandas as pd
 import difflib
 
+# rapidfuzz calcula similitudes Levenshtein en C/SIMD; si no está instalado
+# se mantiene difflib (biblioteca estándar) como alternativa más lenta.
+try:
+    from rapidfuzz import fuzz, process as rf_process
+except ImportError:
+    fuzz = None
+    rf_process = None
+
+# numba compila el núcleo de recolección y suma a código máquina (con hilos)
+# cuando está instalado; si no, se usa la versión NumPy equivalente.
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # New imports for sending e‑mail notifications
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 
+# pandas usa openpyxl por defecto para .xlsx, que es el motor más lento.
+# python-calamine (parser escrito en Rust) es bastante más rápido, así que se
+# usa cuando está instalado; de lo contrario se mantiene el motor por defecto.
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = 'calamine'
+except ImportError:
+    _EXCEL_ENGINE = None
+
+# Con pyarrow instalado, la columna CODIGO se guarda como cadena Arrow:
+# ocupa menos memoria que un arreglo de objetos Python y sus operaciones de
+# comparación/búsqueda corren en kernels C++ en lugar del intérprete.
+try:
+    import pyarrow as pa
+    _ARROW_STRING = pd.ArrowDtype(pa.string())
+except (ImportError, AttributeError):
+    _ARROW_STRING = None
+
+# Columnas de la lista de precios que el servidor realmente utiliza; el resto
+# ni siquiera se materializa al leer el Excel.
+COLUMNAS_LISTA = ('CODIGO', 'DESCRIPCION', 'MARCA', 'CATEGORIA', 'PRECIO VENTA LICI 20%')
+
+# Cache en memoria de la lista de precios ya analizada, indexado por ruta y
+# fecha de modificación del archivo. Así `pd.read_excel` (el paso más caro de
+# cada cotización) se ejecuta una sola vez mientras el archivo no cambie.
+_PRICE_CACHE: dict = {}
+_PRICE_CACHE_LOCK = threading.Lock()
+
+
 def cargar_lista_precios(path: str) -> pd.DataFrame:
     """Carga la lista de precios desde un archivo Excel y normaliza las columnas.
 
+    El resultado se guarda en un cache en memoria con clave
+    (ruta, mtime del archivo), de modo que las solicitudes siguientes
+    reutilicen el DataFrame ya analizado mientras el Excel no cambie.
+
     Args:
         path: Ruta al archivo Excel de la lista de precios.
 
     Returns:
-        DataFrame con las columnas necesarias normalizadas.
+        DataFrame con las columnas necesarias normalizadas. Los llamadores no
+        deben mutarlo; toda la normalización ocurre aquí.
     """
-    df = pd.read_excel(path)
+    mtime_ns = os.stat(path).st_mtime_ns
+    key = (path, mtime_ns)
+    with _PRICE_CACHE_LOCK:
+        df = _PRICE_CACHE.get(key)
+    if df is not None:
+        return df
+    # Cache lateral en Parquet: si existe y es más reciente que el Excel,
+    # leerlo es mucho más rápido que volver a analizar el XLSX (los datos ya
+    # están en formato columnar y con tipos resueltos).
+    cache_path = path + '.parquet'
+    try:
+        if os.path.exists(cache_path) and os.stat(cache_path).st_mtime_ns >= mtime_ns:
+            df = pd.read_parquet(cache_path)
+            df = _indexar_lista(df)
+            with _PRICE_CACHE_LOCK:
+                _PRICE_CACHE.clear()
+                _PRICE_CACHE[key] = df
+            return df
+    except Exception as e:
+        print(f"[auto_cotizar_server] Cache Parquet ilegible, se reanaliza el Excel: {e}")
+    df = pd.read_excel(
+        path,
+        engine=_EXCEL_ENGINE,
+        usecols=lambda c: isinstance(c, str) and c.strip() in COLUMNAS_LISTA,
+    )
     # Eliminar columnas sin nombre o vacías y normalizar nombres
     df = df.rename(columns={c: c.strip() if isinstance(c, str) else c for c in df.columns})
     cols_to_drop = [c for c in df.columns if (isinstance(c, str) and (c.startswith('.') or c.strip() == ''))]
     df = df.drop(columns=cols_to_drop, errors='ignore')
+    # Normalizar los códigos una sola vez para que los llamadores nunca
+    # tengan que mutar el DataFrame cacheado
+    df['CODIGO'] = df['CODIGO'].astype(str)
+    if _ARROW_STRING is not None:
+        df['CODIGO'] = df['CODIGO'].astype(_ARROW_STRING)
+    # Escribir el cache lateral ya normalizado para acelerar arranques fríos
+    try:
+        df.to_parquet(cache_path)
+    except Exception as e:
+        print(f"[auto_cotizar_server] No se pudo escribir el cache Parquet: {e}")
+    df = _indexar_lista(df)
+    with _PRICE_CACHE_LOCK:
+        _PRICE_CACHE.clear()
+        _PRICE_CACHE[key] = df
     return df
 
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _calcular_subtotales(idx, cantidades, precios_arr):
+        """Recolecta precios por índice y acumula subtotales y total.
+
+        Las posiciones negativas (códigos no encontrados) aportan precio 0.
+        """
+        n = idx.size
+        precios = np.empty(n, np.float64)
+        subtotales = np.empty(n, np.float64)
+        total = 0.0
+        for i in prange(n):
+            p = precios_arr[idx[i]] if idx[i] >= 0 else 0.0
+            precios[i] = p
+            s = p * cantidades[i]
+            subtotales[i] = s
+            total += s
+        return precios, subtotales, total
+else:
+    def _calcular_subtotales(idx, cantidades, precios_arr):
+        """Versión NumPy del núcleo de recolección/suma (sin numba)."""
+        if precios_arr.size == 0:
+            # Lista de precios vacía: ninguna posición es válida y no se
+            # puede indexar el arreglo
+            precios = np.zeros(idx.size, dtype=np.float64)
+        else:
+            valido = idx >= 0
+            precios = np.where(valido, precios_arr[np.where(valido, idx, 0)], 0.0)
+        subtotales = precios * cantidades
+        return precios, subtotales, float(subtotales.sum())
+
+
+def _indexar_lista(df: pd.DataFrame) -> pd.DataFrame:
+    """Adjunta al DataFrame las estructuras derivadas que usa la cotización.
+
+    La lista se reorganiza en formato SoA (un arreglo NumPy por columna)
+    junto con un diccionario código -> posición entera, de modo que el join
+    de cada solicitud se reduzca a traducir códigos a enteros una vez y
+    recolectar por índice, sin volver a comparar cadenas. También se
+    construyen las cubetas del emparejamiento aproximado.
+    """
+    codigos = df['CODIGO'].to_numpy()
+    code_pos: dict = {}
+    for i, c in enumerate(codigos):
+        # Ante códigos duplicados gana la primera fila, igual que antes
+        code_pos.setdefault(c, i)
+    df.attrs['code_pos'] = code_pos
+    df.attrs['precios_arr'] = pd.to_numeric(
+        df['PRECIO VENTA LICI 20%'], errors='coerce').fillna(0.0).to_numpy(dtype=np.float64)
+    for col in ('DESCRIPCION', 'MARCA', 'CATEGORIA'):
+        if col in df.columns:
+            arr = df[col].fillna('').astype(str).to_numpy()
+        else:
+            arr = np.full(len(df), '', dtype=object)
+        df.attrs['arr_' + col.lower()] = arr
+    df.attrs['fuzzy_buckets'] = _construir_cubetas(codigos)
+    # Lista Python de códigos para el emparejamiento aproximado; construirla
+    # aquí evita una asignación grande por solicitud
+    df.attrs['all_codes_list'] = codigos.tolist()
+    return df
+
+
+def _clave_cubeta(codigo: str):
+    """Clave de cubeta (prefijo, largo aproximado) para podar candidatos."""
+    return (codigo[:2], len(codigo) // 2)
+
+
+def _construir_cubetas(codigos) -> dict:
+    """Agrupa los códigos de la lista de precios en cubetas (prefijo, largo).
+
+    Los códigos parecidos comparten prefijo y largo similar, así que el
+    emparejamiento aproximado solo necesita comparar cada código perdido
+    contra su cubeta en lugar de contra la lista completa.
+    """
+    cubetas: dict = {}
+    for codigo in codigos:
+        cubetas.setdefault(_clave_cubeta(codigo), []).append(codigo)
+    return cubetas
+
+
+def _buscar_equivalentes(misses, all_codes, cubetas=None):
+    """Busca el código más parecido para cada código sin coincidencia exacta.
+
+    Args:
+        misses: Lista de códigos subidos que no tuvieron coincidencia exacta.
+        all_codes: Lista completa de códigos de la lista de precios.
+        cubetas: Índice opcional (prefijo, largo) -> códigos, construido en
+            la carga de la lista; si está presente, cada código perdido solo
+            se compara contra los candidatos de su cubeta.
+
+    Returns:
+        Diccionario código subido -> código equivalente (solo los que superan
+        el umbral de similitud del 60%).
+
+    Con rapidfuzz disponible la matriz de similitud completa se calcula en una
+    sola llamada a process.cdist (código C, multihilo); de lo contrario se
+    recurre a difflib código por código.
+    """
+    if not misses or not all_codes:
+        return {}
+    if cubetas is not None:
+        resultado = {}
+        for m in misses:
+            candidatos = cubetas.get(_clave_cubeta(m))
+            if not candidatos:
+                continue
+            if rf_process is not None:
+                mejor = rf_process.extractOne(m, candidatos, scorer=fuzz.ratio,
+                                              score_cutoff=60)
+                if mejor:
+                    resultado[m] = mejor[0]
+            else:
+                similar = difflib.get_close_matches(m, candidatos, n=1, cutoff=0.6)
+                if similar:
+                    resultado[m] = similar[0]
+        return resultado
+    if rf_process is not None:
+        scores = rf_process.cdist(misses, all_codes, scorer=fuzz.ratio,
+                                  score_cutoff=60, workers=-1)
+        mejores = scores.argmax(axis=1)
+        return {m: all_codes[j] for m, j, fila in zip(misses, mejores, scores)
+                if fila[j] >= 60}
+    resultado = {}
+    for m in misses:
+        similar = difflib.get_close_matches(m, all_codes, n=1, cutoff=0.6)
+        if similar:
+            resultado[m] = similar[0]
+    return resultado
+
+
 # --- Email utility ---------------------------------------------------------
 #
 # Esta función envía un correo electrónico con el contenido HTML de la
@@ -119,49 +341,29 @@ def send_email(to_email: str, subject: str, html_body: str) -> None:
         print(f"[auto_cotizar_server] Error al enviar el correo: {e}")
 
 
-class CotizarHTTPRequestHandler(BaseHTTPRequestHandler):
-    """Manejador HTTP que permite subir un archivo Excel y devuelve una cotización."""
-
-    # Ruta al archivo de lista de precios (se establece al crear el servidor)
-    lista_precios_path: str = "1 LISTA DE PRECIOS VIGENTE 2025_chat.xlsx"
-
-    def _get_logo_data_uri(self) -> str:
-        """Lee el logo de disco y lo codifica en base64 para incrustarlo en HTML.
-
-        Returns:
-            Una cadena URI de datos para usar en el atributo src de una etiqueta img.
-        """
-        logo_path = os.path.join(os.path.dirname(__file__), "logo.png")
-        try:
-            with open(logo_path, "rb") as f:
-                encoded = base64.b64encode(f.read()).decode("ascii")
-            return f"data:image/png;base64,{encoded}"
-        except Exception:
-            return ""
+# --- Plantillas HTML -------------------------------------------------------
+#
+# Las partes constantes del HTML se construyen una sola vez al importar el
+# módulo; cada solicitud solo interpola los pocos valores variables (logo,
+# filas de la tabla y total general).
 
-    def _render_form(self):
-        """Envía el formulario de carga al cliente."""
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html; charset=utf-8')
-        self.end_headers()
-        logo_src = self._get_logo_data_uri()
-        html = f"""
+FORM_HTML_TEMPLATE = string.Template("""
         <!doctype html>
         <html lang="es">
         <head>
             <meta charset="UTF-8">
             <title>Auto Cotización</title>
             <style>
-                body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #fafafa; }}
-                .header {{ display: flex; align-items: center; gap: 10px; }}
-                .header img {{ height: 60px; }}
-                h1 {{ margin-top: 0; color: #003366; }}
-                .form-container {{ background: #fff; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+                body { font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #fafafa; }
+                .header { display: flex; align-items: center; gap: 10px; }
+                .header img { height: 60px; }
+                h1 { margin-top: 0; color: #003366; }
+                .form-container { background: #fff; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
             </style>
         </head>
         <body>
             <div class="header">
-                <img src="{logo_src}" alt="Logo">
+                <img src="$logo_src" alt="Logo">
                 <h1>Auto Cotización de Productos</h1>
             </div>
             <div class="form-container">
@@ -174,116 +376,9 @@ class CotizarHTTPRequestHandler(BaseHTTPRequestHandler):
             </div>
         </body>
         </html>
-        """
-        self.wfile.write(html.encode('utf-8'))
-
-    def do_GET(self):
-        # Cualquier solicitud GET muestra el formulario
-        self._render_form()
-
-    def do_POST(self):
-        # Procesar archivo cargado
-        form = cgi.FieldStorage(fp=self.rfile,
-                                headers=self.headers,
-                                environ={'REQUEST_METHOD': 'POST',
-                                         'CONTENT_TYPE': self.headers['Content-Type']})
-
-        file_item = form['archivo'] if 'archivo' in form else None
-        if file_item is None or not file_item.filename:
-            # Si no se proporcionó archivo, mostrar formulario nuevamente
-            self._render_form()
-            return
-
-        # Leer archivo subido en memoria
-        uploaded_data = file_item.file.read()
-        # Guardar en un buffer para pandas
-        try:
-            uploaded_df = pd.read_excel(io.BytesIO(uploaded_data))
-        except Exception as e:
-            self.send_response(400)
-            self.send_header('Content-type', 'text/plain; charset=utf-8')
-            self.end_headers()
-            self.wfile.write(f"Error al leer el archivo: {e}".encode('utf-8'))
-            return
-
-        # Asegurar que hay al menos dos columnas
-        if uploaded_df.shape[1] < 2:
-            self.send_response(400)
-            self.send_header('Content-type', 'text/plain; charset=utf-8')
-            self.end_headers()
-            self.wfile.write("El archivo debe tener al menos dos columnas (código y cantidad).".encode('utf-8'))
-            return
-
-        # Extraer códigos y cantidades
-        try:
-            codigos = uploaded_df.iloc[:, 0].astype(str)
-            cantidades = uploaded_df.iloc[:, 1].astype(int)
-        except Exception as e:
-            self.send_response(400)
-            self.send_header('Content-type', 'text/plain; charset=utf-8')
-            self.end_headers()
-            self.wfile.write(f"Error al interpretar códigos y cantidades: {e}".encode('utf-8'))
-            return
-
-        # Cargar lista de precios
-        if not os.path.exists(self.lista_precios_path):
-            self.send_response(500)
-            self.send_header('Content-type', 'text/plain; charset=utf-8')
-            self.end_headers()
-            self.wfile.write(f"Archivo de lista de precios no encontrado: {self.lista_precios_path}".encode('utf-8'))
-            return
+        """)
 
-        lista_df = cargar_lista_precios(self.lista_precios_path)
-        lista_df['CODIGO'] = lista_df['CODIGO'].astype(str)
-
-        # Combinar y calcular totales
-        detalles = []
-        total_general = 0.0
-        all_codes = lista_df['CODIGO'].tolist()
-        for codigo, cantidad in zip(codigos, cantidades):
-            # Buscar coincidencia exacta primero
-            row = lista_df.loc[lista_df['CODIGO'] == codigo]
-            match_type = "Exacta"
-            matched_code = codigo
-            # Si no hay coincidencia exacta, buscar aproximada
-            if row.empty:
-                # Buscar código similar utilizando difflib
-                similar = difflib.get_close_matches(str(codigo), all_codes, n=1, cutoff=0.6)
-                if similar:
-                    matched_code = similar[0]
-                    row = lista_df.loc[lista_df['CODIGO'] == matched_code]
-                    match_type = "Equivalente"
-                else:
-                    # Sin coincidencia aproximada
-                    detalles.append({'codigo': codigo,
-                                     'descripcion': 'NO ENCONTRADO',
-                                     'marca': '',
-                                     'categoria': '',
-                                     'precio_unitario': 0.0,
-                                     'cantidad': cantidad,
-                                     'subtotal': 0.0,
-                                     'tipo': 'No encontrado'})
-                    continue
-            # Obtener información del producto (ya sea exacto o equivalente)
-            info = row.iloc[0]
-            precio = float(info['PRECIO VENTA LICI 20%'])
-            subtotal = precio * cantidad
-            total_general += subtotal
-            detalles.append({'codigo': matched_code,
-                             'descripcion': str(info.get('DESCRIPCION', '')),
-                             'marca': str(info.get('MARCA', '')),
-                             'categoria': str(info.get('CATEGORIA', '')),
-                             'precio_unitario': precio,
-                             'cantidad': cantidad,
-                             'subtotal': subtotal,
-                             'tipo': match_type})
-
-        # Construir respuesta HTML
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html; charset=utf-8')
-        self.end_headers()
-        salida = io.StringIO()
-        salida.write(f"""
+RESULT_HEAD = """
         <!doctype html>
         <html lang="es">
         <head>
@@ -311,33 +406,220 @@ class CotizarHTTPRequestHandler(BaseHTTPRequestHandler):
                     <th>Precio Unitario</th>
                     <th>Subtotal</th>
                 </tr>
-        """)
-        for d in detalles:
-            # Determinar la clase CSS según el tipo de coincidencia
-            row_class = ''
-            if d.get('tipo') == 'Equivalente':
-                row_class = 'aprox'
-            elif d.get('tipo') == 'No encontrado':
-                row_class = 'no-encontrado'
-            salida.write(f"<tr class='{row_class}'>"
-                         f"<td>{d.get('tipo','')}</td>"
-                         f"<td>{d['codigo']}</td>"
-                         f"<td>{d['descripcion']}</td>"
-                         f"<td>{d['marca']}</td>"
-                         f"<td>{d['categoria']}</td>"
-                         f"<td>{d['cantidad']}</td>"
-                         f"<td>${d['precio_unitario']:,.0f}</td>"
-                         f"<td>${d['subtotal']:,.0f}</td>"
-                         f"</tr>")
-        salida.write(f"""
+        """
+
+RESULT_TAIL = """
             </table>
             <h2>Total general: ${total_general:,.0f}</h2>
             <br><a href="/">&#8592; Volver al formulario</a>
         </body>
         </html>
-        """)
-        # Obtener el HTML resultante de la cotización
-        html_result = salida.getvalue()
+        """
+
+# Segmento constante ya codificado: así el camino caliente no vuelve a
+# codificar el encabezado en cada solicitud
+RESULT_HEAD_BYTES = RESULT_HEAD.encode('utf-8')
+
+# Buffer de respuesta reutilizado por hilo; evita reservar y descartar un
+# buffer del tamaño de la respuesta en cada POST
+_TLS = threading.local()
+
+
+class CotizarHTTPRequestHandler(BaseHTTPRequestHandler):
+    """Manejador HTTP que permite subir un archivo Excel y devuelve una cotización."""
+
+    # Con Content-Length en todas las respuestas es legal HTTP/1.1 con
+    # keep-alive: el navegador reutiliza la conexión TCP entre solicitudes
+    protocol_version = 'HTTP/1.1'
+
+    # Ruta al archivo de lista de precios (se establece al crear el servidor)
+    lista_precios_path: str = "1 LISTA DE PRECIOS VIGENTE 2025_chat.xlsx"
+
+    # URI de datos del logo; se calcula una sola vez en run_server en lugar
+    # de releer y recodificar el archivo en cada GET
+    logo_data_uri: str = ""
+
+    def _enviar_html(self, body: bytes, status: int = 200) -> None:
+        """Envía una respuesta HTML, comprimida con gzip si el cliente lo acepta.
+
+        Args:
+            body: Cuerpo HTML ya codificado en UTF-8.
+            status: Código de estado HTTP de la respuesta.
+        """
+        self.send_response(status)
+        self.send_header('Content-type', 'text/html; charset=utf-8')
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            # Nivel 1: la tabla HTML es muy repetitiva, así que incluso la
+            # compresión más rápida reduce los bytes en un orden de magnitud
+            body = gzip.compress(body, compresslevel=1)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _enviar_texto(self, mensaje: str, status: int) -> None:
+        """Envía una respuesta de texto plano en una sola escritura.
+
+        Args:
+            mensaje: Texto del mensaje (por lo general un error).
+            status: Código de estado HTTP de la respuesta.
+        """
+        body = mensaje.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _render_form(self):
+        """Envía el formulario de carga al cliente."""
+        pagina = FORM_HTML_TEMPLATE.substitute(logo_src=self.logo_data_uri)
+        self._enviar_html(pagina.encode('utf-8'))
+
+    def do_GET(self):
+        # Cualquier solicitud GET muestra el formulario
+        self._render_form()
+
+    def do_POST(self):
+        # Procesar archivo cargado
+        form = cgi.FieldStorage(fp=self.rfile,
+                                headers=self.headers,
+                                environ={'REQUEST_METHOD': 'POST',
+                                         'CONTENT_TYPE': self.headers['Content-Type']})
+
+        file_item = form['archivo'] if 'archivo' in form else None
+        if file_item is None or not file_item.filename:
+            # Si no se proporcionó archivo, mostrar formulario nuevamente
+            self._render_form()
+            return
+
+        # Pasar el archivo subido directamente a pandas: FieldStorage ya
+        # vuelca los campos grandes a un archivo temporal, así que no hace
+        # falta duplicar todo el contenido en memoria con un read() previo
+        try:
+            # Sin usecols: un archivo de una sola columna debe llegar a la
+            # validación de abajo en vez de fallar dentro de read_excel con
+            # un error crudo de pandas. Los pedidos subidos son pequeños,
+            # así que leer columnas de más no cuesta nada.
+            uploaded_df = pd.read_excel(file_item.file, engine=_EXCEL_ENGINE)
+        except Exception as e:
+            self._enviar_texto(f"Error al leer el archivo: {e}", 400)
+            return
+
+        # Asegurar que hay al menos dos columnas
+        if uploaded_df.shape[1] < 2:
+            self._enviar_texto(
+                "El archivo debe tener al menos dos columnas (código y cantidad).", 400)
+            return
+
+        # Extraer códigos y cantidades. Las cantidades ilegibles se
+        # convierten en 0 de forma vectorizada (una sola pasada con
+        # to_numeric) en lugar de abortar toda la solicitud por la primera
+        # celda mala
+        codigos = uploaded_df.iloc[:, 0].astype(str)
+        cantidades = pd.to_numeric(uploaded_df.iloc[:, 1], errors='coerce')
+        filas_invalidas = int(cantidades.isna().sum())
+        if filas_invalidas:
+            print(f"[auto_cotizar_server] {filas_invalidas} fila(s) con "
+                  "cantidad ilegible; se cotizan con cantidad 0.")
+        cantidades = cantidades.fillna(0).astype('int64')
+
+        # Cargar lista de precios
+        if not os.path.exists(self.lista_precios_path):
+            self._enviar_texto(
+                f"Archivo de lista de precios no encontrado: {self.lista_precios_path}", 500)
+            return
+
+        lista_df = cargar_lista_precios(self.lista_precios_path)
+
+        # Combinar mediante claves enteras: cada código subido se traduce una
+        # sola vez a su posición en la lista de precios y el resto del join
+        # son recolecciones NumPy por índice (sin comparar cadenas por fila)
+        code_pos = lista_df.attrs['code_pos']
+        codigos_lista = codigos.tolist()
+        idx = np.fromiter((code_pos.get(c, -1) for c in codigos_lista),
+                          dtype=np.int64, count=len(codigos_lista))
+        tipos = np.where(idx >= 0, 'Exacta', 'No encontrado').astype(object)
+
+        # Rescate aproximado solamente para los códigos sin coincidencia
+        # exacta
+        sin_match = np.flatnonzero(idx < 0)
+        if sin_match.size:
+            all_codes = lista_df.attrs['all_codes_list']
+            misses = [codigos_lista[i] for i in sin_match]
+            equivalentes = _buscar_equivalentes(
+                misses, all_codes, cubetas=lista_df.attrs.get('fuzzy_buckets'))
+            for i, codigo in zip(sin_match, misses):
+                eq = equivalentes.get(codigo)
+                if eq is not None:
+                    idx[i] = code_pos[eq]
+                    codigos_lista[i] = eq
+                    tipos[i] = 'Equivalente'
+
+        # Subtotales y total general recolectando por índice entero
+        cantidades_arr = cantidades.to_numpy()
+        precios, subtotales, total_general = _calcular_subtotales(
+            idx, cantidades_arr, lista_df.attrs['precios_arr'])
+        total_general = float(total_general)
+        valido = idx >= 0
+        pos = np.where(valido, idx, 0)
+
+        def _columna_texto(nombre):
+            # Recolecta una columna de texto por posición; con la lista de
+            # precios vacía no hay nada que indexar y todo queda en blanco
+            arr = lista_df.attrs[nombre]
+            if arr.size == 0:
+                return np.full(idx.size, '', dtype=object)
+            return np.where(valido, arr[pos], '')
+
+        no_encontrado = tipos == 'No encontrado'
+        descripciones = np.where(
+            no_encontrado, 'NO ENCONTRADO', _columna_texto('arr_descripcion'))
+
+        # El recorrido fila por fila queda reservado a la emisión del HTML
+        merged = pd.DataFrame({
+            'codigo': codigos_lista,
+            'descripcion': descripciones,
+            'marca': _columna_texto('arr_marca'),
+            'categoria': _columna_texto('arr_categoria'),
+            'precio_unitario': precios,
+            'cantidad': cantidades_arr,
+            'subtotal': subtotales,
+            'tipo': tipos,
+        })
+        # Escapar los valores de texto en una sola pasada por columna antes
+        # de interpolarlos en el HTML (evita además inyección de marcado)
+        for col in ('codigo', 'descripcion', 'marca', 'categoria'):
+            merged[col] = merged[col].astype(str).map(html.escape)
+
+        # Construir la respuesta sobre un bytearray reutilizado por hilo:
+        # los segmentos constantes ya están codificados y el buffer crece
+        # sobre memoria reservada en solicitudes anteriores
+        buf = getattr(_TLS, 'buf', None)
+        if buf is None:
+            buf = bytearray()
+            _TLS.buf = buf
+        buf.clear()
+        buf += RESULT_HEAD_BYTES
+        # Clase CSS según el tipo de coincidencia
+        clases = {'Equivalente': 'aprox', 'No encontrado': 'no-encontrado'}
+        columnas_salida = ['codigo', 'descripcion', 'marca', 'categoria',
+                           'precio_unitario', 'cantidad', 'subtotal', 'tipo']
+        for codigo, descripcion, marca, categoria, \
+                precio_unitario, cantidad, subtotal, tipo \
+                in merged[columnas_salida].itertuples(index=False, name=None):
+            buf += (
+                f"<tr class='{clases.get(tipo, '')}'>"
+                f"<td>{tipo}</td>"
+                f"<td>{codigo}</td>"
+                f"<td>{descripcion}</td>"
+                f"<td>{marca}</td>"
+                f"<td>{categoria}</td>"
+                f"<td>{cantidad}</td>"
+                f"<td>${precio_unitario:,.0f}</td>"
+                f"<td>${subtotal:,.0f}</td>"
+                f"</tr>").encode('utf-8')
+        buf += RESULT_TAIL.format(total_general=total_general).encode('utf-8')
         # Enviar la cotización por correo al área comercial
         # El envío de correo se omite silenciosamente si no se configuran
         # correctamente las credenciales SMTP en las variables de entorno.
@@ -345,21 +627,39 @@ class CotizarHTTPRequestHandler(BaseHTTPRequestHandler):
             send_email(
                 to_email="contacto@firmavb.cl",
                 subject="Nueva cotización generada",
-                html_body=html_result
+                html_body=buf.decode('utf-8')
             )
         except Exception as e:
             # No interrumpir el flujo si hay errores al enviar
             print(f"[auto_cotizar_server] Excepción al enviar correo: {e}")
         # Escribir la respuesta al cliente
-        self.wfile.write(html_result.encode('utf-8'))
+        self._enviar_html(buf)
+
+
+def _compute_logo_uri() -> str:
+    """Lee el logo de disco y lo codifica en base64 para incrustarlo en HTML.
+
+    Returns:
+        Una cadena URI de datos para usar en el atributo src de una etiqueta img.
+    """
+    logo_path = os.path.join(os.path.dirname(__file__), "logo.png")
+    try:
+        with open(logo_path, "rb") as f:
+            encoded = base64.b64encode(f.read()).decode("ascii")
+        return f"data:image/png;base64,{encoded}"
+    except Exception:
+        return ""
 
 
 def run_server(lista_precios_path: str, port: int):
     """Inicia el servidor de cotización en el puerto especificado."""
     handler_class = CotizarHTTPRequestHandler
     handler_class.lista_precios_path = lista_precios_path
+    handler_class.logo_data_uri = _compute_logo_uri()
     server_address = ('', port)
-    httpd = HTTPServer(server_address, handler_class)
+    # ThreadingHTTPServer atiende cada conexión en su propio hilo; así una
+    # solicitud que está analizando un Excel no bloquea al resto de clientes
+    httpd = ThreadingHTTPServer(server_address, handler_class)
     print(f"Servidor iniciado en http://localhost:{port}/")
     print(f"Usando lista de precios: {lista_precios_path}")
     httpd.serve_forever()
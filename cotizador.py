@@ -22,13 +22,22 @@ pasando un diccionario de rutas en la llamada a `generar_cotizacion()`.
 
 from __future__ import annotations
 
+import csv
 import datetime
+import hashlib
+import io
 import os
+import pickle
+import shutil
+import tempfile
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import Iterable, List, Dict, NamedTuple, Optional
 
 import pandas as pd
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -38,10 +47,46 @@ from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import (SimpleDocTemplate, Paragraph, Image,
                                 Spacer, Table, TableStyle)
 
-
-@dataclass
+# La validación de formas de ReportLab (shapeChecking) revisa cada
+# asignación de atributo durante doc.build y encarece todo el armado del PDF.
+# Se desactiva salvo que se pida depuración definiendo la variable de entorno
+# COTIZADOR_DEBUG. Debe ocurrir antes de crear cualquier objeto de ReportLab.
+if not os.environ.get("COTIZADOR_DEBUG"):
+    rl_config.shapeChecking = 0
+
+# pandas usa openpyxl por defecto para .xlsx; python-calamine (parser en
+# Rust) es bastante más rápido y se usa cuando está instalado.
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = 'calamine'
+except ImportError:
+    _EXCEL_ENGINE = None
+
+# Columnas de la lista de precios que el cotizador realmente utiliza; el
+# resto ni siquiera se materializa al leer el Excel.
+COLUMNAS_LISTA = ('CODIGO', 'DESCRIPCION', 'MARCA', 'CATEGORIA', 'PRECIO VENTA LICI 20%')
+
+# Estilos de ReportLab construidos una sola vez al importar el módulo;
+# recrearlos en cada PDF (getSampleStyleSheet copia decenas de estilos) es un
+# costo innecesario por cotización.
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = _STYLES['Title']
+_NORMAL_STYLE = _STYLES['Normal']
+_SUBTITLE_STYLE = ParagraphStyle(
+    name='Subtitle', parent=_STYLES['Heading2'], fontSize=14, leading=16)
+_TABLE_HEADER_STYLE = ParagraphStyle(
+    name='TableHeader', parent=_STYLES['Heading4'], alignment=1, fontSize=10,
+    textColor=colors.white)
+
+
+@dataclass(slots=True)
 class ProductoCotizado:
-    """Representa un producto incluido en una cotización."""
+    """Representa un producto incluido en una cotización.
+
+    Con slots cada instancia prescinde del __dict__: ocupa cerca de un
+    tercio de la memoria y el acceso a atributos es más rápido, lo que se
+    nota en cotizaciones con cientos de líneas.
+    """
 
     codigo: str
     descripcion: str
@@ -57,46 +102,180 @@ class ProductoCotizado:
         return self.precio_unitario * self.cantidad
 
 
+# Descripciones generales de usos según la categoría o la descripción del
+# producto. Las claves se dejan precalculadas en mayúsculas a nivel de módulo
+# para que _obtener_usos no vuelva a llamar .upper() sobre cada clave por
+# producto.
+_USOS_GENERALES = {
+    'PLASTIFICACION SEMI INDUSTRIAL ROLLOS': 'Ideal para laminar documentos con una capa protectora transparente en empresas, oficinas o centros de copiado.',
+    'CORCHETE 26/6': 'Recomendado para agrupar documentos y papeles de tamaño estándar.',
+    'GRIP': 'Accesorio ergonómico para mejorar el agarre y la comodidad al escribir con lápiz o pluma.',
+    'LIBRETA APUNTES': 'Cuaderno compacto para tomar notas, tareas escolares o apuntes diarios.',
+}
+_USOS = tuple((clave.upper(), valor) for clave, valor in _USOS_GENERALES.items())
+
+# Con pyahocorasick instalado, todas las claves de usos se compilan en un
+# único autómata multi-patrón (extensión C): una sola pasada lineal sobre el
+# texto en lugar de un barrido por clave. Escala si el catálogo de usos crece
+# a decenas o cientos de frases.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+if ahocorasick is not None:
+    _USOS_AUTOMATON = ahocorasick.Automaton()
+    for _clave_u, _valor in _USOS:
+        _USOS_AUTOMATON.add_word(_clave_u, _valor)
+    _USOS_AUTOMATON.make_automaton()
+else:
+    _USOS_AUTOMATON = None
+
+_FONTS_REGISTERED = False
+
+
+def _ensure_fonts() -> None:
+    """Registra las fuentes TTF personalizadas una sola vez por proceso.
+
+    Re-registrar fuentes por documento obliga a ReportLab a reparsear los
+    archivos de fuente en cada PDF (y en Windows a escanear el directorio de
+    fuentes del sistema). Cualquier pdfmetrics.registerFont futuro debe
+    agregarse aquí, nunca dentro de _crear_pdf.
+    """
+    global _FONTS_REGISTERED
+    if _FONTS_REGISTERED:
+        return
+    # Por ahora las cotizaciones usan las fuentes estándar de ReportLab; las
+    # TTFont personalizadas se registran aquí cuando se necesiten, p. ej.:
+    # pdfmetrics.registerFont(TTFont('FirmaVB', 'FirmaVB-Regular.ttf'))
+    _FONTS_REGISTERED = True
+
+
+_ensure_fonts()
+
+
+@lru_cache(maxsize=128)
+def _leer_imagen(path: str, mtime_ns: int) -> bytes:
+    """Lee los bytes de una imagen una sola vez por (ruta, mtime).
+
+    Los productos suelen repetir imágenes dentro de una cotización y entre
+    cotizaciones; cachear los bytes evita releer el archivo en cada fila.
+    El flowable Image de platypus solo acepta una ruta o un objeto archivo,
+    así que los bytes cacheados se le entregan envueltos en un BytesIO.
+    El mtime en la clave invalida la entrada si el archivo cambia.
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class _PrecioRow(NamedTuple):
+    """Fila ligera de la lista de precios (sin estructuras de pandas)."""
+
+    codigo: str
+    descripcion: str
+    marca: str
+    categoria: str
+    precio: float
+
+
+# Cache en memoria de listas de precios ya analizadas, con clave
+# (ruta, mtime). Crear varios Cotizador sobre el mismo archivo (por ejemplo
+# uno por cotización) deja de releer el Excel cada vez.
+_LISTA_CACHE: Dict[tuple, Dict[str, _PrecioRow]] = {}
+
+
 class Cotizador:
     """Gestiona la lectura de precios y la generación de cotizaciones."""
 
     def __init__(self, ruta_lista_precios: str, ruta_registro: str = "cotizaciones_registro.csv"):
         self.ruta_lista_precios = ruta_lista_precios
         self.ruta_registro = ruta_registro
-        self._df = self._cargar_lista_precios()
+        self._productos = self._cargar_lista_precios()
+
+    def _cargar_lista_precios(self) -> Dict[str, _PrecioRow]:
+        """Carga la lista de precios como un diccionario código -> fila.
 
-    def _cargar_lista_precios(self) -> pd.DataFrame:
-        """Carga el archivo de lista de precios en un DataFrame.
+        El DataFrame de pandas solo vive durante la carga: una vez leído el
+        Excel, la lista se materializa en un dict de _PrecioRow, así cada
+        búsqueda es un acceso hash sin pasar por la maquinaria de pandas y
+        la estructura residente en memoria es varias veces más compacta.
+        El dict se guarda en un cache en memoria con clave (ruta, mtime)
+        para no releer el Excel mientras no cambie.
 
-        Retorna: DataFrame con las columnas normalizadas.
+        Retorna: Diccionario código -> _PrecioRow.
         """
-        df = pd.read_excel(self.ruta_lista_precios)
+        stat = os.stat(self.ruta_lista_precios)
+        key = (self.ruta_lista_precios, stat.st_mtime_ns, stat.st_size)
+        # La clave identifica el contenido de la lista cargada; el cache de
+        # PDFs la incorpora para invalidarse cuando el Excel cambia
+        self._clave_lista = key
+        productos = _LISTA_CACHE.get(key)
+        if productos is not None:
+            return productos
+        # Cache lateral en disco: leer el dict ya materializado con pickle es
+        # órdenes de magnitud más rápido que volver a analizar el XLSX en un
+        # arranque frío. La clave (mtime, tamaño) guardada dentro del archivo
+        # lo invalida cuando el Excel cambia.
+        cache_path = self.ruta_lista_precios + '.cache.pkl'
+        try:
+            if os.path.exists(cache_path):
+                with open(cache_path, 'rb') as f:
+                    clave_guardada, productos = pickle.load(f)
+                if clave_guardada == key:
+                    _LISTA_CACHE.clear()
+                    _LISTA_CACHE[key] = productos
+                    return productos
+        except Exception as e:
+            print(f"[cotizador] Cache de lista ilegible, se reanaliza el Excel: {e}")
+        df = pd.read_excel(
+            self.ruta_lista_precios,
+            engine=_EXCEL_ENGINE,
+            usecols=lambda c: isinstance(c, str) and c.strip() in COLUMNAS_LISTA,
+        )
         # Eliminar columnas sin nombre o vacías
         df = df.rename(columns={c: c.strip() if isinstance(c, str) else c for c in df.columns})
         cols_to_drop = [c for c in df.columns if c.startswith('.') or c.strip() == '']
         df = df.drop(columns=cols_to_drop, errors='ignore')
-        return df
+        productos = {}
+        for codigo, descripcion, marca, categoria, precio in zip(
+                df['CODIGO'].astype(str), df['DESCRIPCION'], df['MARCA'],
+                df['CATEGORIA'], df['PRECIO VENTA LICI 20%']):
+            # Ante códigos duplicados gana la primera fila
+            productos.setdefault(codigo, _PrecioRow(
+                codigo=codigo,
+                descripcion=str(descripcion),
+                marca=str(marca),
+                categoria=str(categoria),
+                precio=float(precio),
+            ))
+        try:
+            with open(cache_path, 'wb') as f:
+                pickle.dump((key, productos), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"[cotizador] No se pudo escribir el cache de lista: {e}")
+        _LISTA_CACHE.clear()
+        _LISTA_CACHE[key] = productos
+        return productos
 
     def buscar_producto(self, codigo: str) -> Optional[Dict]:
         """Busca un producto en la lista de precios por su código.
 
         Retorna un diccionario con la información o None si no existe.
         """
-        row = self._df.loc[self._df['CODIGO'] == codigo]
-        if row.empty:
+        fila = self._productos.get(str(codigo))
+        if fila is None:
             return None
-        row = row.iloc[0]
         return {
-            'codigo': str(row['CODIGO']),
-            'descripcion': str(row['DESCRIPCION']),
-            'marca': str(row['MARCA']),
-            'categoria': str(row['CATEGORIA']),
-            'precio': float(row['PRECIO VENTA LICI 20%']),
+            'codigo': fila.codigo,
+            'descripcion': fila.descripcion,
+            'marca': fila.marca,
+            'categoria': fila.categoria,
+            'precio': fila.precio,
         }
 
     def generar_cotizacion(self,
                             cliente: str,
-                            productos_solicitados: List[Dict[str, int]],
+                            productos_solicitados: Iterable[Dict],
                             imagenes: Optional[Dict[str, str]] = None,
                             ruta_salida: Optional[str] = None,
                             guardar_registro: bool = True) -> str:
@@ -104,7 +283,10 @@ class Cotizador:
 
         Args:
             cliente: Nombre del cliente o empresa solicitante.
-            productos_solicitados: Lista de dicts con claves 'codigo' y 'cantidad'.
+            productos_solicitados: Iterable (lista o generador) de dicts con
+                claves 'codigo' y 'cantidad'. Se recorre una sola vez y se
+                condensa de inmediato en tuplas ligeras, por lo que el
+                llamador no necesita materializar pedidos masivos.
             imagenes: Diccionario que mapea códigos a rutas de imagen.
             ruta_salida: Ruta donde se guardará el PDF. Si es None se genera una
                 ruta por defecto.
@@ -116,32 +298,84 @@ class Cotizador:
         if imagenes is None:
             imagenes = {}
 
+        # Consumir el iterable una sola vez hacia tuplas (codigo, cantidad);
+        # luego resolver todos los códigos en bloque contra el dict de la
+        # lista y detectar los faltantes de una vez, sin pasar por
+        # buscar_producto (y su dict intermedio) código por código
+        pedidos = [(str(item['codigo']), int(item.get('cantidad', 1)))
+                   for item in productos_solicitados]
+        filas = {codigo: self._productos.get(codigo) for codigo, _ in pedidos}
+        faltantes = [codigo for codigo, fila in filas.items() if fila is None]
+        if faltantes:
+            raise ValueError(
+                "Código de producto no encontrado: " + ", ".join(faltantes))
+
         # Construir lista de objetos ProductoCotizado
         productos: List[ProductoCotizado] = []
-        for item in productos_solicitados:
-            codigo = str(item['codigo'])
-            cantidad = int(item.get('cantidad', 1))
-            info = self.buscar_producto(codigo)
-            if not info:
-                raise ValueError(f"Código de producto no encontrado: {codigo}")
-            prod = ProductoCotizado(
-                codigo=info['codigo'],
-                descripcion=info['descripcion'],
-                marca=info['marca'],
-                categoria=info['categoria'],
-                precio_unitario=info['precio'],
+        for codigo, cantidad in pedidos:
+            fila = filas[codigo]
+            productos.append(ProductoCotizado(
+                codigo=fila.codigo,
+                descripcion=fila.descripcion,
+                marca=fila.marca,
+                categoria=fila.categoria,
+                precio_unitario=fila.precio,
                 cantidad=cantidad,
                 imagen_path=imagenes.get(codigo)
-            )
-            productos.append(prod)
+            ))
 
         # Crear ruta de salida
         if ruta_salida is None:
+            # El sufijo aleatorio evita que dos cotizaciones del mismo cliente
+            # generadas en el mismo segundo (p. ej. desde el pool de procesos)
+            # se pisen en disco
             fecha_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            ruta_salida = f"cotizacion_{cliente.replace(' ', '_')}_{fecha_str}.pdf"
-
-        # Generar PDF
-        self._crear_pdf(cliente, productos, ruta_salida)
+            sufijo = uuid.uuid4().hex[:8]
+            ruta_salida = (
+                f"cotizacion_{cliente.replace(' ', '_')}_{fecha_str}_{sufijo}.pdf")
+
+        # Cache de PDFs en disco: regenerar la misma cotización (común al
+        # revisar presupuestos) se convierte en una copia de bytes. La fecha
+        # forma parte de la clave porque el documento la imprime, igual que
+        # las imágenes asociadas a cada producto. La clave de la lista de
+        # precios cubre los textos (descripción, marca, categoría) y el mtime
+        # de cada imagen cubre su reemplazo en disco: cualquiera de esos
+        # cambios produce un PDF distinto y no debe servirse del cache.
+        def _mtime_imagen(ruta):
+            if not ruta:
+                return None
+            try:
+                return os.stat(ruta).st_mtime_ns
+            except OSError:
+                return None
+
+        clave_pdf = hashlib.sha1(repr((
+            cliente,
+            datetime.date.today().isoformat(),
+            self._clave_lista,
+            [(p.codigo, p.cantidad, p.precio_unitario,
+              p.imagen_path, _mtime_imagen(p.imagen_path))
+             for p in productos],
+        )).encode('utf-8')).hexdigest()
+        cache_pdf = os.path.join('.cache', f"cotizacion_{clave_pdf}.pdf")
+
+        if os.path.exists(cache_pdf):
+            # Generación repetida: copiar los bytes ya armados
+            shutil.copyfile(cache_pdf, ruta_salida)
+        else:
+            # Generar PDF
+            self._crear_pdf(cliente, productos, ruta_salida)
+            try:
+                os.makedirs('.cache', exist_ok=True)
+                # Publicación atómica: copiar a un temporal y renombrar, para
+                # que otro proceso del pool que genere la misma cotización
+                # nunca vea (ni copie) un archivo de cache a medio escribir
+                fd, tmp = tempfile.mkstemp(dir='.cache', suffix='.pdf')
+                os.close(fd)
+                shutil.copyfile(ruta_salida, tmp)
+                os.replace(tmp, cache_pdf)
+            except OSError as e:
+                print(f"[cotizador] No se pudo guardar el PDF en el cache: {e}")
 
         # Registrar cotización
         if guardar_registro:
@@ -149,21 +383,49 @@ class Cotizador:
 
         return ruta_salida
 
+    def generar_cotizaciones_batch(self,
+                                   trabajos: List[Dict],
+                                   max_workers: Optional[int] = None) -> List[str]:
+        """Genera varias cotizaciones en paralelo usando procesos.
+
+        El armado del PDF en ReportLab es trabajo Python puro que retiene el
+        GIL, de modo que el único paralelismo efectivo es por proceso. Cada
+        trabajador construye su propio Cotizador; gracias al cache en disco
+        de la lista de precios, eso no vuelve a analizar el Excel.
+
+        Args:
+            trabajos: Lista de dicts con los argumentos de
+                `generar_cotizacion` (cliente, productos_solicitados, etc.).
+            max_workers: Número máximo de procesos trabajadores; None usa el
+                valor por defecto del ProcessPoolExecutor.
+
+        Retorna:
+            Lista con las rutas de los PDF generados, en el mismo orden que
+            `trabajos`.
+        """
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futuros = [
+                pool.submit(_generar_cotizacion_worker,
+                            self.ruta_lista_precios, self.ruta_registro, trabajo)
+                for trabajo in trabajos
+            ]
+            return [futuro.result() for futuro in futuros]
+
     def _crear_pdf(self, cliente: str, productos: List[ProductoCotizado], ruta_salida: str) -> None:
         """Crea el archivo PDF con el detalle de la cotización."""
-        # Estilos
-        styles = getSampleStyleSheet()
-        title_style = styles['Title']
-        normal_style = styles['Normal']
-        subtitle_style = ParagraphStyle(
-            name='Subtitle', parent=styles['Heading2'], fontSize=14, leading=16)
-        table_header_style = ParagraphStyle(
-            name='TableHeader', parent=styles['Heading4'], alignment=1, fontSize=10,
-            textColor=colors.white)
+        # Estilos compartidos construidos al importar el módulo
+        title_style = _TITLE_STYLE
+        normal_style = _NORMAL_STYLE
+        subtitle_style = _SUBTITLE_STYLE
+        table_header_style = _TABLE_HEADER_STYLE
 
         # Documento
+        # Armar el PDF en memoria y escribirlo a disco en una sola llamada;
+        # el escritor de ReportLab hace muchas escrituras pequeñas que salen
+        # caras contra disco (sobre todo en unidades de red)
+        buffer_pdf = io.BytesIO()
         doc = SimpleDocTemplate(
-            ruta_salida, pagesize=letter, rightMargin=20, leftMargin=20, topMargin=30, bottomMargin=30
+            buffer_pdf, pagesize=letter, rightMargin=20, leftMargin=20, topMargin=30, bottomMargin=30
         )
         elementos: List = []
 
@@ -193,37 +455,56 @@ class Cotizador:
         ]
         datos_tabla.append(encabezados)
 
-        # Colores de filas alternados
-        row_colors = [colors.whitesmoke, colors.lightgrey]
+        # Subtotales y columnas de precio pre-calculados en una sola pasada:
+        # así cada subtotal se multiplica una vez (no una para la celda y
+        # otra para el total) y el formateo queda en comprensiones compactas
+        subtotales = [p.precio_unitario * p.cantidad for p in productos]
+        total_general = sum(subtotales)
+        precios_fmt = [f"${p.precio_unitario:,.0f}" for p in productos]
+        subtotales_fmt = [f"${s:,.0f}" for s in subtotales]
+
+        # Validar las rutas de imagen por adelantado: un solo stat por ruta
+        # única (que además entrega el mtime para el cache de imágenes) en
+        # lugar de un syscall por fila
+        imagenes_validas = {}
+        for ruta in {p.imagen_path for p in productos if p.imagen_path}:
+            try:
+                imagenes_validas[ruta] = os.stat(ruta).st_mtime_ns
+            except OSError:
+                pass
 
-        total_general = 0.0
         for idx, prod in enumerate(productos):
             fila = []
             # Imagen (reducida)
-            if prod.imagen_path and os.path.exists(prod.imagen_path):
-                img = Image(prod.imagen_path, width=20*mm, height=20*mm)
+            mtime_ns = imagenes_validas.get(prod.imagen_path)
+            if mtime_ns is not None:
+                datos_imagen = _leer_imagen(prod.imagen_path, mtime_ns)
+                img = Image(io.BytesIO(datos_imagen), width=20*mm, height=20*mm)
             else:
                 # Si no hay imagen, espacio vacío
                 img = Spacer(20*mm, 20*mm)
             fila.append(img)
+            # Las celdas simples van como cadenas planas: la Table las dibuja
+            # directamente sin pasar por el parser XML ni el motor de párrafos
+            # de Paragraph. Solo descripción y categoría, que pueden requerir
+            # salto de línea, siguen siendo Paragraph.
             # Código
-            fila.append(Paragraph(prod.codigo, normal_style))
+            fila.append(prod.codigo)
             # Descripción (cortada si es muy larga)
             descripcion = (prod.descripcion[:90] + '...') if len(prod.descripcion) > 90 else prod.descripcion
             fila.append(Paragraph(descripcion, normal_style))
             # Marca
-            fila.append(Paragraph(prod.marca, normal_style))
+            fila.append(prod.marca)
             # Categoría
             fila.append(Paragraph(prod.categoria, normal_style))
             # Cantidad
-            fila.append(Paragraph(str(prod.cantidad), normal_style))
+            fila.append(str(prod.cantidad))
             # Precio unitario
-            fila.append(Paragraph(f"${prod.precio_unitario:,.0f}", normal_style))
+            fila.append(precios_fmt[idx])
             # Subtotal
-            fila.append(Paragraph(f"${prod.subtotal:,.0f}", normal_style))
+            fila.append(subtotales_fmt[idx])
 
             datos_tabla.append(fila)
-            total_general += prod.subtotal
 
         # Configurar estilo de la tabla
         tabla = Table(datos_tabla, colWidths=[25*mm, 22*mm, 60*mm, 25*mm, 40*mm, 20*mm, 25*mm, 25*mm])
@@ -232,11 +513,11 @@ class Cotizador:
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
             ('GRID', (0, 0), (-1, -1), 0.25, colors.black),
             ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+            # Filas alternadas con un único comando en vez de un BACKGROUND
+            # por fila
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1),
+             [colors.whitesmoke, colors.lightgrey]),
         ])
-        # Filas alternadas
-        for i in range(1, len(datos_tabla)):
-            bg_color = row_colors[(i-1) % 2]
-            estilo_tabla.add('BACKGROUND', (0, i), (-1, i), bg_color)
         tabla.setStyle(estilo_tabla)
 
         elementos.append(tabla)
@@ -255,20 +536,24 @@ class Cotizador:
             elementos.append(Spacer(1, 4))
 
         doc.build(elementos)
+        with open(ruta_salida, 'wb') as f:
+            f.write(buffer_pdf.getvalue())
 
     def _obtener_usos(self, categoria: str, descripcion: str) -> str:
         """Devuelve una descripción de usos principales según la categoría o la descripción."""
-        # Diccionario con descripciones generales de usos según la categoría
-        usos_generales = {
-            'PLASTIFICACION SEMI INDUSTRIAL ROLLOS': 'Ideal para laminar documentos con una capa protectora transparente en empresas, oficinas o centros de copiado.',
-            'CORCHETE 26/6': 'Recomendado para agrupar documentos y papeles de tamaño estándar.',
-            'GRIP': 'Accesorio ergonómico para mejorar el agarre y la comodidad al escribir con lápiz o pluma.',
-            'LIBRETA APUNTES': 'Cuaderno compacto para tomar notas, tareas escolares o apuntes diarios.',
-        }
-        # Buscar categoría exacta
-        for key, value in usos_generales.items():
-            if key.upper() in categoria.upper() or key.upper() in descripcion.upper():
-                return value
+        # Pasar las entradas a mayúsculas una sola vez; las claves ya están
+        # precalculadas en mayúsculas a nivel de módulo
+        categoria_u = categoria.upper()
+        descripcion_u = descripcion.upper()
+        if _USOS_AUTOMATON is not None:
+            # Una sola pasada lineal sobre ambos textos con el autómata
+            for _fin, valor in _USOS_AUTOMATON.iter(
+                    categoria_u + '\n' + descripcion_u):
+                return valor
+        else:
+            for clave_u, valor in _USOS:
+                if clave_u in categoria_u or clave_u in descripcion_u:
+                    return valor
         # Genérico si no se encuentra
         return 'Producto de la categoría "{}" con usos generales de oficina o escolares.'.format(categoria)
 
@@ -288,9 +573,26 @@ class Cotizador:
             'archivo_pdf': ruta_pdf,
             'estado': 'pendiente'
         }
-        # Escribir en CSV
-        df_registro = pd.DataFrame([registro])
-        if os.path.exists(self.ruta_registro):
-            df_registro.to_csv(self.ruta_registro, mode='a', header=False, index=False)
-        else:
-            df_registro.to_csv(self.ruta_registro, index=False)
\ No newline at end of file
+        # Escribir en CSV con el módulo csv: anexar una fila no necesita
+        # construir un DataFrame ni pasar por el serializador de pandas.
+        # La cabecera se escribe con creación exclusiva ('x') para que dos
+        # procesos que registran a la vez no la dupliquen: sólo el que crea
+        # el archivo la escribe y los demás se limitan a anexar su fila.
+        try:
+            with open(self.ruta_registro, 'x', newline='', encoding='utf-8') as f:
+                csv.DictWriter(f, fieldnames=list(registro)).writeheader()
+        except FileExistsError:
+            pass
+        with open(self.ruta_registro, 'a', newline='', encoding='utf-8') as f:
+            csv.DictWriter(f, fieldnames=list(registro)).writerow(registro)
+
+def _generar_cotizacion_worker(ruta_lista_precios: str,
+                               ruta_registro: str,
+                               trabajo: Dict) -> str:
+    """Genera una cotización dentro de un proceso trabajador del lote.
+
+    Debe ser una función de nivel de módulo para que ProcessPoolExecutor
+    pueda serializarla con pickle.
+    """
+    cotizador = Cotizador(ruta_lista_precios, ruta_registro=ruta_registro)
+    return cotizador.generar_cotizacion(**trabajo)